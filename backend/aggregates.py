@@ -0,0 +1,181 @@
+import threading
+from datetime import timedelta
+
+from .schemas import AggregateWindow, StationAggregatesResponse
+
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+
+
+def numeric_values(report):
+    """Devuelve `(temperatura ºC, ráfaga kt, visibilidad m, QNH hPa)` de un `MetarResponse`."""
+    return (
+        report.temperature.air_c,
+        report.wind.gusts_kt,
+        report.visibility.meters,
+        report.qnh_hpa,
+    )
+
+
+class _Bucket:
+    __slots__ = (
+        "start",
+        "observations",
+        "count",
+        "temp_count",
+        "temp_sum",
+        "temp_min",
+        "temp_max",
+        "gust_max",
+        "visibility_min",
+        "qnh_first",
+        "qnh_last",
+    )
+
+    def __init__(self, start):
+        self.start = start
+        # Valores por hora de observación, para que una corrección sustituya al original.
+        self.observations = {}
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.temp_count = 0
+        self.temp_sum = 0
+        self.temp_min = None
+        self.temp_max = None
+        self.gust_max = None
+        self.visibility_min = None
+        # (hora de observación, QNH) del primer y último informe con QNH del cubo.
+        self.qnh_first = None
+        self.qnh_last = None
+
+    def add(self, observed_at, values):
+        replaced = observed_at in self.observations
+        self.observations[observed_at] = values
+        if not replaced:
+            self._accumulate(observed_at, *values)
+            return
+        # Las correcciones (COR) son raras: se recalcula solo este cubo.
+        self._reset()
+        for when, previous in self.observations.items():
+            self._accumulate(when, *previous)
+
+    def _accumulate(self, observed_at, temperature, gust, visibility, qnh):
+        self.count += 1
+        if temperature is not None:
+            self.temp_count += 1
+            self.temp_sum += temperature
+            self.temp_min = temperature if self.temp_min is None else min(self.temp_min, temperature)
+            self.temp_max = temperature if self.temp_max is None else max(self.temp_max, temperature)
+        if gust is not None:
+            self.gust_max = gust if self.gust_max is None else max(self.gust_max, gust)
+        if visibility is not None:
+            self.visibility_min = visibility if self.visibility_min is None else min(self.visibility_min, visibility)
+        if qnh is not None:
+            if self.qnh_first is None or observed_at < self.qnh_first[0]:
+                self.qnh_first = (observed_at, qnh)
+            if self.qnh_last is None or observed_at >= self.qnh_last[0]:
+                self.qnh_last = (observed_at, qnh)
+
+
+def _merge(buckets, window, since, until):
+    count = sum(b.count for b in buckets)
+    temp_count = sum(b.temp_count for b in buckets)
+    temp_mins = [b.temp_min for b in buckets if b.temp_min is not None]
+    temp_maxs = [b.temp_max for b in buckets if b.temp_max is not None]
+    gusts = [b.gust_max for b in buckets if b.gust_max is not None]
+    visibilities = [b.visibility_min for b in buckets if b.visibility_min is not None]
+    qnh_firsts = [b.qnh_first for b in buckets if b.qnh_first is not None]
+    qnh_lasts = [b.qnh_last for b in buckets if b.qnh_last is not None]
+
+    return AggregateWindow(
+        window=window,
+        since=since,
+        until=until,
+        reports=count,
+        temperature_min=min(temp_mins) if temp_mins else None,
+        temperature_max=max(temp_maxs) if temp_maxs else None,
+        temperature_mean=(
+            round(sum(b.temp_sum for b in buckets) / temp_count, 1) if temp_count else None
+        ),
+        gust_max=max(gusts) if gusts else None,
+        visibility_min=min(visibilities) if visibilities else None,
+        qnh_trend=max(qnh_lasts)[1] - min(qnh_firsts)[1] if qnh_firsts else None,
+    )
+
+
+class _StationRollup:
+    def __init__(self):
+        self.latest = None
+        self.hourly = {}
+        self.daily = {}
+
+    def add(self, observed_at, values):
+        if self.latest is None or observed_at > self.latest:
+            self.latest = observed_at
+            self._expire()
+
+        hour_start = observed_at.replace(minute=0, second=0, microsecond=0)
+        day_start = hour_start.replace(hour=0)
+        # Los informes más antiguos que la ventana retenida se ignoran.
+        if hour_start > self.latest - 24 * _HOUR:
+            self.hourly.setdefault(hour_start, _Bucket(hour_start)).add(observed_at, values)
+        if day_start > self.latest - 7 * _DAY:
+            self.daily.setdefault(day_start, _Bucket(day_start)).add(observed_at, values)
+
+    def _expire(self):
+        hour_cutoff = self.latest - 24 * _HOUR
+        day_cutoff = self.latest - 7 * _DAY
+        for start in [s for s in self.hourly if s <= hour_cutoff]:
+            del self.hourly[start]
+        for start in [s for s in self.daily if s <= day_cutoff]:
+            del self.daily[start]
+
+    def rollups(self):
+        current_hour = self.latest.replace(minute=0, second=0, microsecond=0)
+        current_day = current_hour.replace(hour=0)
+        windows = [
+            ("1h", self.hourly, current_hour, current_hour + _HOUR),
+            ("24h", self.hourly, current_hour - 23 * _HOUR, current_hour + _HOUR),
+            ("7d", self.daily, current_day - 6 * _DAY, current_day + _DAY),
+        ]
+        return [
+            _merge([b for start, b in buckets.items() if start >= since], name, since, until)
+            for name, buckets, since, until in windows
+        ]
+
+
+class RollingAggregates:
+    """Agregados por estación mantenidos en memoria durante la ingesta.
+
+    Cada informe actualiza un cubo horario y uno diario (O(1)). Un informe con
+    la misma estación y hora que otro ya agregado (p. ej. un `METAR COR`)
+    sustituye su contribución en lugar de sumarse. Las ventanas de 1h y 24h se
+    sirven desde los cubos horarios y la de 7d desde los diarios.
+    Las ventanas se calculan respecto a la observación más reciente de cada
+    estación. Como `DDHHMMZ` no lleva mes ni año, los informes de un archivo
+    histórico solo se sitúan bien si la ingesta indica una fecha de referencia;
+    sin ella se asume un flujo en directo.
+    """
+
+    def __init__(self):
+        self._stations = {}
+        self._lock = threading.Lock()
+
+    def add(self, station, observed_at, report):
+        values = numeric_values(report)
+        with self._lock:
+            self._stations.setdefault(station, _StationRollup()).add(observed_at, values)
+
+    def get(self, station):
+        with self._lock:
+            rollup = self._stations.get(station)
+            if rollup is None:
+                return None
+            return StationAggregatesResponse(
+                station=station,
+                latest_observation=rollup.latest,
+                windows=rollup.rollups(),
+            )
@@ -1,4 +1,7 @@
-﻿SPANISH_AIRPORTS = {
+﻿import csv
+from pathlib import Path
+
+SPANISH_AIRPORTS = {
     "LECO": "A Coruña",
     "LEAB": "Albacete",
     "LEAL": "Alicante-Elche",
@@ -56,4 +59,14 @@
     "EGLL": "Londres Heathrow",
     "KJFK": "Nueva York JFK",
     "EDDF": "Frankfurt",
-}
\ No newline at end of file
+}
+
+
+def _load_coordinates():
+    path = Path(__file__).parent / "data" / "airport_coordinates.csv"
+    with path.open(encoding="utf-8", newline="") as handle:
+        return {row["icao"]: (float(row["lat"]), float(row["lon"])) for row in csv.DictReader(handle)}
+
+
+# (latitud, longitud) en grados decimales de cada estación de SPANISH_AIRPORTS.
+AIRPORT_COORDINATES = _load_coordinates()
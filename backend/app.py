@@ -1,10 +1,28 @@
 import os
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from .schemas import MetarRequest, MetarResponse
+from .aggregates import RollingAggregates
+from .ingest import DedupIndex, ingest_reports
+from .schemas import (
+    IngestRequest,
+    IngestResponse,
+    MetarRequest,
+    MetarResponse,
+    StationAggregatesResponse,
+    StationResult,
+)
+from .serialization import (
+    CBOR_MEDIA_TYPE,
+    COMPACT_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    compact_layout,
+    encode_model,
+    negotiate_media_type,
+)
 from .service import decode_metar_payload
+from .stations import STATION_INDEX, LatestReports, station_results
 
 
 def _cors_origins() -> list[str]:
@@ -16,8 +34,17 @@ def _cors_origins() -> list[str]:
     return parsed or ["http://127.0.0.1:5173", "http://localhost:5173"]
 
 
+def _dedup_index() -> DedupIndex:
+    max_entries = int(os.getenv("METAR_STALL_DEDUP_WINDOW", "100000"))
+    bloom_capacity = int(os.getenv("METAR_STALL_DEDUP_BLOOM_CAPACITY", "0"))
+    return DedupIndex(max_entries=max_entries, bloom_capacity=bloom_capacity or None)
+
+
 def create_app() -> FastAPI:
     app = FastAPI(title="METAR-Stall API")
+    dedup_index = _dedup_index()
+    aggregates = RollingAggregates()
+    latest_reports = LatestReports()
 
     app.add_middleware(
         CORSMiddleware,
@@ -27,15 +54,78 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    @app.post("/decode", response_model=MetarResponse)
-    async def decode_metar(request: MetarRequest):
+    @app.post(
+        "/decode",
+        response_model=MetarResponse,
+        responses={
+            200: {
+                "content": {
+                    MSGPACK_MEDIA_TYPE: {},
+                    CBOR_MEDIA_TYPE: {},
+                    COMPACT_MEDIA_TYPE: {},
+                }
+            }
+        },
+    )
+    async def decode_metar(request: MetarRequest, accept: str | None = Header(default=None)):
         try:
-            return decode_metar_payload(request.metar)
+            decoded = decode_metar_payload(request.metar)
         except ValueError as error:
             raise HTTPException(status_code=400, detail=str(error)) from error
         except Exception as error:
             raise HTTPException(status_code=500, detail="Error interno al procesar el METAR") from error
 
+        media_type = negotiate_media_type(accept)
+        return Response(
+            content=encode_model(decoded, media_type),
+            media_type=media_type,
+            headers={"Vary": "Accept"},
+        )
+
+    # Función síncrona: FastAPI la ejecuta en el threadpool y la decodificación
+    # del lote no bloquea el bucle de eventos. Los índices compartidos se
+    # protegen con sus propios locks.
+    @app.post("/ingest", response_model=IngestResponse)
+    def ingest(request: IngestRequest):
+        return ingest_reports(
+            request.metars,
+            dedup_index,
+            aggregates,
+            latest_reports,
+            reference_time=request.reference_time,
+        )
+
+    @app.get("/stations/nearest", response_model=list[StationResult])
+    async def nearest_stations(
+        lat: float = Query(..., ge=-90, le=90),
+        lon: float = Query(..., ge=-180, le=180),
+        k: int = Query(5, ge=1, le=50),
+    ):
+        return station_results(STATION_INDEX, latest_reports, STATION_INDEX.nearest(lat, lon, k))
+
+    @app.get("/stations/bbox", response_model=list[StationResult])
+    async def stations_in_bbox(
+        min_lat: float = Query(..., ge=-90, le=90),
+        min_lon: float = Query(..., ge=-180, le=180),
+        max_lat: float = Query(..., ge=-90, le=90),
+        max_lon: float = Query(..., ge=-180, le=180),
+    ):
+        if min_lat > max_lat:
+            raise HTTPException(status_code=400, detail="min_lat no puede ser mayor que max_lat")
+        matches = STATION_INDEX.within_bbox(min_lat, min_lon, max_lat, max_lon)
+        return station_results(STATION_INDEX, latest_reports, [(icao, None) for icao in matches])
+
+    @app.get("/stations/{station}/aggregates", response_model=StationAggregatesResponse)
+    async def station_aggregates(station: str):
+        rollup = aggregates.get(station.upper())
+        if rollup is None:
+            raise HTTPException(status_code=404, detail="No hay informes ingeridos para esta estación")
+        return rollup
+
+    @app.get("/decode/layout")
+    async def decode_layout():
+        return {"fields": compact_layout(MetarResponse)}
+
     @app.get("/")
     async def root():
         return {"message": "Spanish METAR Decoder API is running"}
@@ -0,0 +1,231 @@
+import argparse
+import random
+import sys
+
+from .airports import SPANISH_AIRPORTS
+
+
+MAX_REPORT_LENGTH = 512
+
+_STATIONS = sorted(SPANISH_AIRPORTS)
+_VISIBILITIES = [9999] * 12 + [8000, 7000, 6000, 5000, 4000, 3000, 2500, 2000, 1500, 1200, 800, 600, 400, 300, 150, 100, 50]
+_WEATHER = [
+    ("-RA", 10),
+    ("RA", 6),
+    ("+RA", 2),
+    ("-DZ", 3),
+    ("SHRA", 4),
+    ("-SHRA", 4),
+    ("TSRA", 2),
+    ("+TSRA", 1),
+    ("TSGR", 1),
+    ("-SN", 1),
+    ("BR", 8),
+    ("FG", 3),
+    ("BCFG", 2),
+    ("MIFG", 2),
+    ("PRFG", 1),
+    ("HZ", 4),
+    ("FU", 1),
+    ("DU", 1),
+    ("VCSH", 3),
+    ("VCTS", 1),
+    ("FZFG", 1),
+    ("DRSA", 1),
+]
+_WEATHER_CODES = [code for code, _ in _WEATHER]
+_WEATHER_WEIGHTS = [weight for _, weight in _WEATHER]
+_RECENT_WEATHER = ["RERA", "RESHRA", "RETS", "RETSRA", "REDZ", "RESN"]
+
+
+def _direction(rng):
+    return rng.randrange(0, 36) * 10 + 10
+
+
+def _wind_group(rng, auto):
+    if auto and rng.random() < 0.03:
+        return ["/////KT"]
+    speed = min(int(rng.gammavariate(2.0, 4.5)), 60)
+    if speed == 0:
+        return ["00000KT"]
+    if speed <= 3 and rng.random() < 0.5:
+        return [f"VRB{speed:02d}KT"]
+
+    direction = _direction(rng)
+    group = f"{direction:03d}{speed:02d}"
+    if speed >= 12 and rng.random() < 0.35:
+        group += f"G{speed + rng.randint(10, 20):02d}"
+    groups = [group + "KT"]
+    if speed >= 3 and rng.random() < 0.1:
+        low = (direction - rng.choice([60, 80, 100])) % 360 or 360
+        high = (direction + rng.choice([40, 60, 80])) % 360 or 360
+        groups.append(f"{low:03d}V{high:03d}")
+    return groups
+
+
+def _rvr_groups(rng, count):
+    groups = []
+    runways = rng.sample(["01", "06", "13", "18", "19", "24", "25", "31", "32", "36"], count)
+    for runway in runways:
+        side = rng.choice(["", "", "L", "R", "C"])
+        value = rng.choice(["0150", "0300", "0550", "0800", "1100", "P1500", "P2000", "M0050"])
+        if rng.random() < 0.2:
+            value += "V" + rng.choice(["0800", "1200", "P1500"])
+        tendency = rng.choice(["", "U", "D", "N"])
+        groups.append(f"R{runway}{side}/{value}{tendency}")
+    return groups
+
+
+def _cloud_groups(rng, auto, weather):
+    if auto and rng.random() < 0.05:
+        return [rng.choice(["//////", "BKN///", "NCD"])]
+    if "FG" in " ".join(weather) and rng.random() < 0.4:
+        return [rng.choice(["VV001", "VV002", "VV///"])]
+    if rng.random() < 0.15:
+        return ["NCD" if auto else "NSC"]
+
+    groups = []
+    height = rng.choice([2, 4, 6, 8, 10, 15, 20, 25, 30, 40])
+    for cover in sorted(rng.sample(["FEW", "SCT", "BKN", "OVC"], rng.randint(1, 3)), key="FEW SCT BKN OVC".index):
+        suffix = ""
+        if any(w.startswith(("TS", "+TS", "VCTS")) for w in weather) and rng.random() < 0.5:
+            suffix = "CB"
+        elif rng.random() < 0.05:
+            suffix = "TCU"
+        groups.append(f"{cover}{height:03d}{suffix}")
+        height += rng.choice([10, 15, 20, 30, 50])
+    return groups
+
+
+def _temperature_group(rng, auto):
+    if auto and rng.random() < 0.02:
+        return rng.choice(["/////", f"{rng.randint(0, 30):02d}///"])
+    air = int(rng.gauss(15, 8))
+    dew = air - abs(int(rng.gauss(5, 4)))
+
+    def fmt(value):
+        return f"M{-value:02d}" if value < 0 else f"{value:02d}"
+
+    return f"{fmt(air)}/{fmt(dew)}"
+
+
+def _trend_body(rng):
+    options = [
+        lambda: " ".join(_wind_group(rng, False)),
+        lambda: f"{rng.choice(_VISIBILITIES[12:]):04d}",
+        lambda: rng.choices(_WEATHER_CODES, _WEATHER_WEIGHTS)[0],
+        lambda: rng.choice(["BKN010", "SCT015", "OVC005", "BKN020CB", "FEW030TCU"]),
+        lambda: "NSW",
+        lambda: "CAVOK",
+    ]
+    parts = [option() for option in rng.sample(options, rng.randint(1, 3))]
+    if rng.random() < 0.3:
+        parts.insert(0, rng.choice(["FM", "TL", "AT"]) + f"{rng.randint(0, 23):02d}{rng.choice(['00', '30'])}")
+    return " ".join(parts)
+
+
+def _trend_groups(rng):
+    roll = rng.random()
+    if roll < 0.5:
+        return ["NOSIG"]
+    if roll < 0.65:
+        return [f"{rng.choice(['TEMPO', 'BECMG'])} {_trend_body(rng)}" for _ in range(rng.randint(1, 2))]
+    return []
+
+
+def generate_report(rng):
+    """Genera un informe METAR/SPECI sintácticamente válido al estilo español."""
+    kind = "SPECI" if rng.random() < 0.08 else "METAR"
+    auto = rng.random() < 0.15
+    minute = rng.randrange(0, 60) if kind == "SPECI" else rng.choice([0, 30])
+    parts = [
+        kind,
+        rng.choice(_STATIONS),
+        f"{rng.randint(1, 28):02d}{rng.randint(0, 23):02d}{minute:02d}Z",
+    ]
+    if auto:
+        parts.append("AUTO")
+    parts.extend(_wind_group(rng, auto))
+
+    weather = []
+    if rng.random() < 0.25:
+        parts.append("CAVOK")
+    else:
+        if auto and rng.random() < 0.03:
+            visibility = 0
+            parts.append("////")
+        else:
+            visibility = rng.choice(_VISIBILITIES)
+            parts.append(f"{visibility:04d}")
+        if 0 < visibility < 1500:
+            parts.extend(_rvr_groups(rng, rng.randint(1, 2)))
+        if visibility < 5000 or rng.random() < 0.2:
+            weather = rng.choices(_WEATHER_CODES, _WEATHER_WEIGHTS, k=rng.randint(1, 2))
+            weather = list(dict.fromkeys(weather))
+            parts.extend(weather)
+        parts.extend(_cloud_groups(rng, auto, weather))
+
+    parts.append(_temperature_group(rng, auto))
+    parts.append(f"Q{int(rng.gauss(1015, 8)):04d}" if not (auto and rng.random() < 0.02) else "Q////")
+    if rng.random() < 0.05:
+        parts.append(rng.choice(_RECENT_WEATHER))
+    parts.extend(_trend_groups(rng))
+    return " ".join(parts) + "="
+
+
+def generate_adversarial_report(rng):
+    """Genera informes límite: longitud máxima, cadenas de tendencias y grupos repetidos."""
+    head = f"{rng.choice(['METAR', 'SPECI'])} {rng.choice(_STATIONS)} {rng.randint(1, 28):02d}{rng.randint(0, 23):02d}00Z"
+    mode = rng.choice(["trend_chain", "empty_trends", "clouds", "rvr", "slashes", "weather"])
+    filler = {
+        "trend_chain": lambda: f"{rng.choice(['TEMPO', 'BECMG'])} {_trend_body(rng)}",
+        "empty_trends": lambda: rng.choice(["TEMPO", "BECMG", "TEMPO BECMG", "BECMG TEMPO"]),
+        "clouds": lambda: f"{rng.choice(['FEW', 'SCT', 'BKN', 'OVC'])}{rng.randint(1, 999):03d}{rng.choice(['', 'CB', 'TCU'])}",
+        "rvr": lambda: _rvr_groups(rng, 1)[0],
+        "slashes": lambda: rng.choice(["/////KT", "////", "//////", "BKN///", "VV///", "/////", "Q////", "R24/////"]),
+        "weather": lambda: rng.choice(_WEATHER_CODES),
+    }[mode]
+
+    report = f"{head} {' '.join(_wind_group(rng, False))} 9999 FEW020 15/10 Q1013"
+    while True:
+        candidate = f"{report} {filler()}"
+        if len(candidate) + 1 > MAX_REPORT_LENGTH:
+            break
+        report = candidate
+    return report + "="
+
+
+def iter_reports(count, seed=0, adversarial=False):
+    """Produce `count` informes deterministas para la semilla dada."""
+    rng = random.Random(seed)
+    generate = generate_adversarial_report if adversarial else generate_report
+    for _ in range(count):
+        yield generate(rng)
+
+
+def write_corpus(stream, count, seed=0, adversarial=False):
+    for report in iter_reports(count, seed, adversarial):
+        stream.write(report)
+        stream.write("\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un corpus sintético de METAR para benchmarks")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--adversarial", action="store_true")
+    parser.add_argument("--output", default="-", help="Fichero de salida ('-' para stdout)")
+    return parser.parse_args(argv)
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    if args.output == "-":
+        write_corpus(sys.stdout, args.count, args.seed, args.adversarial)
+        return
+    with open(args.output, "w", encoding="utf-8", newline="\n") as stream:
+        write_corpus(stream, args.count, args.seed, args.adversarial)
+
+
+if __name__ == "__main__":
+    run()
@@ -4,6 +4,77 @@ from datetime import datetime, timedelta, timezone
 
 from .airports import SPANISH_AIRPORTS
 
+# Los grupos se reconocen token a token con expresiones ancladas y de longitud
+# acotada, de modo que el coste de `parse` es lineal en la longitud del METAR.
+_WIND_RE = re.compile(r"(\d{3}|VRB)(\d{2,3})(G\d{2,3})?KT")
+_WIND_VARIATION_RE = re.compile(r"(\d{3})V(\d{3})")
+_VERTICAL_VISIBILITY_RE = re.compile(r"VV(\d{3}|///)")
+_QNH_RE = re.compile(r"Q([\d/]{4})")
+_CLOUD_RE = re.compile(r"(FEW|SCT|BKN|OVC|NSC|NCD)(\d{3}|///)?(CB|TCU)?")
+_TREND_KEYWORDS = {"BECMG", "TEMPO"}
+
+_WEATHER_MAP = {
+    "VC": "en proximidades",
+    "MI": "bajo",
+    "BC": "bancos",
+    "PR": "parcial",
+    "DR": "ventisca baja",
+    "BL": "ventisca alta",
+    "SH": "chubasco",
+    "TS": "tormenta",
+    "FZ": "engelante",
+    "DZ": "llovizna",
+    "RA": "lluvia",
+    "SN": "nieve",
+    "SG": "cinarra",
+    "IC": "cristales de hielo",
+    "PL": "hielo granulado",
+    "GR": "granizo",
+    "GS": "granizo pequeño",
+    "BR": "neblina",
+    "FG": "niebla",
+    "FU": "humo",
+    "VA": "ceniza volcánica",
+    "DU": "polvo",
+    "SA": "arena",
+    "HZ": "calima",
+}
+_WEATHER_CODES = set(_WEATHER_MAP)
+_WEATHER_DESCRIPTORS = {"MI", "BC", "PR", "DR", "BL", "SH", "TS", "FZ"}
+
+
+def resolve_metar_datetime(day, hour, minute, reference=None):
+    """Sitúa un día/hora de METAR en el mes más cercano a `reference` (por defecto, ahora).
+
+    Un grupo `DDHHMMZ` no incluye mes ni año: para archivos históricos hay que
+    pasar una fecha de referencia próxima a la observación.
+    """
+    now_utc = reference or datetime.now(timezone.utc)
+    if now_utc.tzinfo is None:
+        now_utc = now_utc.replace(tzinfo=timezone.utc)
+    candidates = []
+    for month_shift in (-1, 0, 1):
+        base = now_utc.replace(day=15, hour=0, minute=0, second=0, microsecond=0)
+        month_base = base + timedelta(days=31 * month_shift)
+        year = month_base.year
+        month = month_base.month
+        max_day = monthrange(year, month)[1]
+        if day <= max_day:
+            candidates.append(datetime(year, month, day, hour, minute, tzinfo=timezone.utc))
+    if not candidates:
+        return None
+    return min(candidates, key=lambda dt: abs((dt - now_utc).total_seconds()))
+
+
+def resolve_observation_time(obs_time, reference=None):
+    """Convierte un grupo `DDHHMMZ` en fecha UTC (ver `resolve_metar_datetime`)."""
+    day = int(obs_time[:2])
+    hour = int(obs_time[2:4])
+    minute = int(obs_time[4:6])
+    if not (1 <= day <= 31 and hour <= 23 and minute <= 59):
+        return None
+    return resolve_metar_datetime(day, hour, minute, reference)
+
 
 class SpanishMetarParser:
     def __init__(self, raw_metar):
@@ -21,14 +92,17 @@ class SpanishMetarParser:
                 "gusts": None,
                 "variation": None,
                 "degrees": None,
+                "speed_kt": None,
+                "gusts_kt": None,
                 "text": None,
             },
-            "visibility": {"main": None, "minimum": None, "vertical": None, "text": None},
+            "visibility": {"main": None, "minimum": None, "vertical": None, "meters": None, "text": None},
             "weather": [],
             "recent_weather": [],
             "clouds": [],
-            "temperature": {"air": None, "dewpoint": None, "text": None},
+            "temperature": {"air": None, "dewpoint": None, "air_c": None, "dewpoint_c": None, "text": None},
             "qnh": None,
+            "qnh_hpa": None,
             "qnh_text": None,
             "rvr": [],
             "remarks": None,
@@ -115,22 +189,6 @@ class SpanishMetarParser:
 
         return sentence
 
-    @staticmethod
-    def _resolve_metar_datetime(day, hour, minute):
-        now_utc = datetime.now(timezone.utc)
-        candidates = []
-        for month_shift in (-1, 0, 1):
-            base = now_utc.replace(day=15, hour=0, minute=0, second=0, microsecond=0)
-            month_base = base + timedelta(days=31 * month_shift)
-            year = month_base.year
-            month = month_base.month
-            max_day = monthrange(year, month)[1]
-            if day <= max_day:
-                candidates.append(datetime(year, month, day, hour, minute, tzinfo=timezone.utc))
-        if not candidates:
-            return None
-        return min(candidates, key=lambda dt: abs((dt - now_utc).total_seconds()))
-
     @staticmethod
     def _last_sunday(year, month):
         last_day = monthrange(year, month)[1]
@@ -149,33 +207,6 @@ class SpanishMetarParser:
 
     @staticmethod
     def _decode_weather_token(token):
-        weather_map = {
-            "VC": "en proximidades",
-            "MI": "bajo",
-            "BC": "bancos",
-            "PR": "parcial",
-            "DR": "ventisca baja",
-            "BL": "ventisca alta",
-            "SH": "chubasco",
-            "TS": "tormenta",
-            "FZ": "engelante",
-            "DZ": "llovizna",
-            "RA": "lluvia",
-            "SN": "nieve",
-            "SG": "cinarra",
-            "IC": "cristales de hielo",
-            "PL": "hielo granulado",
-            "GR": "granizo",
-            "GS": "granizo pequeño",
-            "BR": "neblina",
-            "FG": "niebla",
-            "FU": "humo",
-            "VA": "ceniza volcánica",
-            "DU": "polvo",
-            "SA": "arena",
-            "HZ": "calima",
-        }
-        valid_codes = set(weather_map.keys())
 
         if not re.match(r"^[-+A-Z]+$", token):
             return None
@@ -191,18 +222,18 @@ class SpanishMetarParser:
 
         vc = ""
         if token[idx:idx + 2] == "VC":
-            vc = weather_map["VC"]
+            vc = _WEATHER_MAP["VC"]
             idx += 2
 
         descriptor = ""
-        if token[idx:idx + 2] in {"MI", "BC", "PR", "DR", "BL", "SH", "TS", "FZ"}:
-            descriptor = weather_map[token[idx:idx + 2]]
+        if token[idx:idx + 2] in _WEATHER_DESCRIPTORS:
+            descriptor = _WEATHER_MAP[token[idx:idx + 2]]
             idx += 2
 
         phenomena_codes = []
         while idx + 1 < len(token):
             code = token[idx:idx + 2]
-            if code not in valid_codes:
+            if code not in _WEATHER_CODES:
                 return None
             phenomena_codes.append(code)
             idx += 2
@@ -210,7 +241,7 @@ class SpanishMetarParser:
         if not phenomena_codes:
             return None
 
-        phenomena_text = " y ".join(weather_map[c] for c in phenomena_codes)
+        phenomena_text = " y ".join(_WEATHER_MAP[c] for c in phenomena_codes)
         core = f"{descriptor} con {phenomena_text}" if descriptor else phenomena_text
 
         if vc:
@@ -271,6 +302,28 @@ class SpanishMetarParser:
 
         return " ".join(parts)
 
+    @staticmethod
+    def _first_fullmatch(pattern, tokens):
+        for token in tokens:
+            match = pattern.fullmatch(token)
+            if match:
+                return match
+        return None
+
+    @staticmethod
+    def _split_trends(tokens):
+        # Cada BECMG/TEMPO abre un grupo que llega hasta el siguiente indicador
+        # o el final. Un indicador sin nada detrás (último token) se ignora.
+        # `tokens` ya viene sin el "=" de fin de mensaje.
+        trends = []
+        for idx, token in enumerate(tokens):
+            if token in _TREND_KEYWORDS:
+                if idx + 1 < len(tokens):
+                    trends.append((token, []))
+            elif trends and token:
+                trends[-1][1].append(token)
+        return trends
+
     def parse(self):
         if not self.validate_format():
             raise ValueError("Formato METAR inválido: faltan estación o fecha/hora")
@@ -278,6 +331,8 @@ class SpanishMetarParser:
         start_idx = 0
         if self.tokens[0] in ["METAR", "SPECI"]:
             start_idx = 1
+        if len(self.tokens) > start_idx and self.tokens[start_idx] == "COR":
+            start_idx += 1
 
         if len(self.tokens) > start_idx:
             station = self.tokens[start_idx]
@@ -290,7 +345,7 @@ class SpanishMetarParser:
             day = int(dt[:2])
             hour = int(dt[2:4])
             minute = int(dt[4:6])
-            dt_utc = self._resolve_metar_datetime(day, hour, minute)
+            dt_utc = resolve_metar_datetime(day, hour, minute)
             if dt_utc:
                 offset_hours = self._spain_gmt_offset(dt_utc)
                 dt_es = dt_utc + timedelta(hours=offset_hours)
@@ -319,12 +374,15 @@ class SpanishMetarParser:
         ]
 
         remaining_text = " ".join(remaining_tokens)
+        # Tokens sin el "=" de fin de mensaje, para reconocer grupos completos.
+        group_tokens = [token.rstrip("=") for token in remaining_tokens]
 
-        wind_match = re.search(r"\b(\d{3}|VRB)(\d{2,3})(G\d{2,3})?KT\b", remaining_text)
+        wind_match = self._first_fullmatch(_WIND_RE, group_tokens)
         if wind_match:
             dir_val = wind_match.group(1)
             speed_kt = int(wind_match.group(2))
             self.decoded["wind"]["speed"] = f"{speed_kt} kt"
+            self.decoded["wind"]["speed_kt"] = speed_kt
 
             if dir_val != "VRB":
                 degrees = int(dir_val)
@@ -339,6 +397,7 @@ class SpanishMetarParser:
             if wind_match.group(3):
                 gusts_kt = int(wind_match.group(3)[1:])
                 self.decoded["wind"]["gusts"] = f"{gusts_kt} kt"
+                self.decoded["wind"]["gusts_kt"] = gusts_kt
                 wind_text += f" y ráfagas de hasta {gusts_kt} nudos"
 
             self.decoded["wind"]["text"] = wind_text
@@ -351,7 +410,7 @@ class SpanishMetarParser:
                     f"Viento reportado como {wind_token_slash}, con datos parciales o no disponibles."
                 )
 
-        var_match = re.search(r"\b(\d{3})V(\d{3})\b", remaining_text)
+        var_match = self._first_fullmatch(_WIND_VARIATION_RE, group_tokens)
         if var_match:
             self.decoded["wind"]["variation"] = f"Entre {var_match.group(1)}° y {var_match.group(2)}°"
             if self.decoded["wind"].get("text"):
@@ -361,6 +420,7 @@ class SpanishMetarParser:
 
         if "CAVOK" in remaining_text:
             self.decoded["visibility"]["main"] = "CAVOK"
+            self.decoded["visibility"]["meters"] = 9999
             self.decoded["visibility"]["text"] = "Visibilidad de 10 kilómetros o más y sin nubes significativas"
             self.decoded["clouds"].append("Cielo despejado (CAVOK)")
         else:
@@ -371,6 +431,7 @@ class SpanishMetarParser:
             if vis_token:
                 meters = int(vis_token)
                 self.decoded["visibility"]["main"] = "10 km o más" if meters == 9999 else f"{meters} m"
+                self.decoded["visibility"]["meters"] = meters
                 self.decoded["visibility"]["text"] = f"Visibilidad de {self._format_distance_meters(meters)}"
             else:
                 vis_token_slash = next((t for t in remaining_tokens if re.match(r"^[\d/]{4}$", t) and "/" in t), None)
@@ -394,7 +455,7 @@ class SpanishMetarParser:
             else:
                 self.decoded["visibility"]["text"] = " ".join(rvr_descriptions)
 
-        vv_match = re.search(r"\bVV(\d{3}|///)\b", remaining_text)
+        vv_match = self._first_fullmatch(_VERTICAL_VISIBILITY_RE, group_tokens)
         if vv_match:
             vv_value = vv_match.group(1)
             if vv_value == "///":
@@ -422,6 +483,13 @@ class SpanishMetarParser:
                 break
 
         if temp_match:
+            def temp_value(token):
+                if token in {"/", "//"}:
+                    return None
+                if token.startswith("M"):
+                    return -int(token[1:])
+                return int(token)
+
             def convert_temp(token):
                 if token in {"/", "//"}:
                     return "No disponible"
@@ -439,11 +507,13 @@ class SpanishMetarParser:
             air, dew = temp_match
             self.decoded["temperature"]["air"] = convert_temp(air)
             self.decoded["temperature"]["dewpoint"] = convert_temp(dew)
+            self.decoded["temperature"]["air_c"] = temp_value(air)
+            self.decoded["temperature"]["dewpoint_c"] = temp_value(dew)
             self.decoded["temperature"]["text"] = (
                 f"Temperatura de {convert_temp_text(air)} y punto de rocío de {convert_temp_text(dew)}"
             )
 
-        qnh_match = re.search(r"\bQ([\d/]{4})", remaining_text)
+        qnh_match = next(filter(None, (_QNH_RE.match(token) for token in group_tokens)), None)
         if qnh_match:
             qnh_val = qnh_match.group(1)
             if "/" in qnh_val:
@@ -451,9 +521,12 @@ class SpanishMetarParser:
                 self.decoded["qnh_text"] = f"QNH no disponible (grupo Q{qnh_val})"
             else:
                 self.decoded["qnh"] = f"{qnh_val} hPa"
+                self.decoded["qnh_hpa"] = int(qnh_val)
                 self.decoded["qnh_text"] = f"QNH de {qnh_val} hectopascales"
 
-        cloud_patterns = re.findall(r"\b(FEW|SCT|BKN|OVC|NSC|NCD)(\d{3}|///)?(CB|TCU)?\b", remaining_text)
+        cloud_patterns = [
+            match.groups(default="") for match in map(_CLOUD_RE.fullmatch, group_tokens) if match
+        ]
         cloud_map = {
             "FEW": "Pocas nubes (1 a 2 octas)",
             "SCT": "Nubes dispersas (3 a 4 octas)",
@@ -492,9 +565,8 @@ class SpanishMetarParser:
         if "NOSIG" in remaining_text:
             self.decoded["trends"].append("Sin cambios significativos (NOSIG)")
 
-        trend_matches = re.findall(r"\b(BECMG|TEMPO)\s+(.*?)(?=\bBECMG\b|\bTEMPO\b|$)", remaining_text)
-        for trend_type, content in trend_matches:
-            self.decoded["trends"].append(f"{trend_type}: {content.strip()}")
+        for trend_type, content in self._split_trends(group_tokens):
+            self.decoded["trends"].append(f"{trend_type}: {' '.join(content)}")
 
         self.decoded["report_text"] = self._build_report_text(self.decoded)
         return self.decoded
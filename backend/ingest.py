@@ -0,0 +1,169 @@
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict
+
+from .decoder import resolve_observation_time
+from .schemas import IngestResponse
+from .service import decode_metar_payload
+
+
+_STATION_RE = re.compile(r"^[A-Z]{4}$")
+_TIME_RE = re.compile(r"^\d{6}Z$")
+_PREFIXES = {"METAR", "SPECI", "COR"}
+
+
+def normalize_report(raw_metar):
+    """Devuelve `(estación, DDHHMMZ, cuerpo normalizado)` o `None` si no se puede indexar.
+
+    El cuerpo se normaliza en mayúsculas, con espacios simples, sin el prefijo
+    `METAR`/`SPECI`/`COR` y sin el `=` final, de forma que las retransmisiones
+    del mismo informe produzcan la misma clave.
+    """
+    tokens = raw_metar.strip().upper().rstrip("=").split()
+    while tokens and tokens[0] in _PREFIXES:
+        tokens = tokens[1:]
+
+    station = next((t for t in tokens[:3] if _STATION_RE.match(t)), None)
+    obs_time = next((t for t in tokens[:4] if _TIME_RE.match(t)), None)
+    if not station or not obs_time:
+        return None
+    return station, obs_time, " ".join(tokens)
+
+
+def _digest(*parts):
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre un `bytearray`, dimensionado por capacidad y tasa de falsos positivos."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        if capacity <= 0:
+            raise ValueError("La capacidad del filtro de Bloom debe ser positiva")
+        if not 0 < error_rate < 1:
+            raise ValueError("La tasa de error del filtro de Bloom debe estar entre 0 y 1")
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        # Doble hashing (Kirsch-Mitzenmacher) a partir de un único digest de 128 bits.
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, digest):
+        """Añade el digest y devuelve `True` si (probablemente) ya estaba presente."""
+        present = True
+        for pos in self._positions(digest):
+            byte, bit = divmod(pos, 8)
+            mask = 1 << bit
+            if not self.bits[byte] & mask:
+                present = False
+                self.bits[byte] |= mask
+        return present
+
+    def __contains__(self, digest):
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(digest))
+
+
+class DedupIndex:
+    """Índice de duplicados por (estación, DDHHMMZ, cuerpo normalizado).
+
+    Por defecto guarda los digests en un conjunto exacto acotado a `max_entries`
+    (se descartan primero los más antiguos). Con `bloom_capacity` usa un filtro
+    de Bloom para backfills de varios años: memoria constante a cambio de una
+    pequeña tasa de falsos positivos. Los informes sustituidos (misma estación y
+    hora con distinto cuerpo) solo se detectan en modo exacto.
+    """
+
+    def __init__(self, max_entries=100_000, bloom_capacity=None, bloom_error_rate=0.001):
+        self.max_entries = max_entries
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else None
+        self._seen = OrderedDict()
+        self._latest_body = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, station, obs_time, body):
+        """Registra la clave y devuelve `"duplicate"`, `"superseded"` o `"new"`."""
+        key = _digest(station, obs_time, body)
+        with self._lock:
+            return self._check(station, obs_time, key)
+
+    def _check(self, station, obs_time, key):
+        if self.bloom is not None:
+            return "duplicate" if self.bloom.add(key) else "new"
+
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return "duplicate"
+
+        self._seen[key] = None
+        if len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+        slot = (station, obs_time)
+        previous = self._latest_body.get(slot)
+        self._latest_body[slot] = key
+        self._latest_body.move_to_end(slot)
+        if len(self._latest_body) > self.max_entries:
+            self._latest_body.popitem(last=False)
+        # `_seen` puede haber descartado ya la clave aunque `_latest_body` la
+        # conserve: un reenvío idéntico sigue siendo un duplicado.
+        if previous == key:
+            return "duplicate"
+        return "superseded" if previous is not None else "new"
+
+
+def ingest_reports(raw_reports, index, aggregates=None, latest_reports=None, reference_time=None):
+    """Descarta duplicados con `index` y decodifica solo los informes nuevos.
+
+    Si se pasan `aggregates` o `latest_reports`, cada informe decodificado los
+    actualiza. `reference_time` sitúa los grupos `DDHHMMZ` en su mes y año
+    (por defecto, la hora actual).
+    """
+    reports = []
+    received = 0
+    duplicates = 0
+    superseded = 0
+    invalid = 0
+
+    for raw_metar in raw_reports:
+        received += 1
+        normalized = normalize_report(raw_metar)
+        if normalized is None:
+            invalid += 1
+            continue
+
+        status = index.check(*normalized)
+        if status == "duplicate":
+            duplicates += 1
+            continue
+        if status == "superseded":
+            superseded += 1
+
+        try:
+            decoded = decode_metar_payload(raw_metar)
+        except ValueError:
+            invalid += 1
+            continue
+
+        reports.append(decoded)
+        observed_at = resolve_observation_time(normalized[1], reference_time)
+        if observed_at is None:
+            continue
+        if aggregates is not None:
+            aggregates.add(normalized[0], observed_at, decoded)
+        if latest_reports is not None:
+            latest_reports.add(normalized[0], observed_at, decoded)
+
+    return IngestResponse(
+        received=received,
+        accepted=len(reports),
+        duplicates=duplicates,
+        superseded=superseded,
+        invalid=invalid,
+        reports=reports,
+    )
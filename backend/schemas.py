@@ -1,6 +1,24 @@
 import re
+from datetime import datetime
+from typing import Annotated
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints, field_validator
+
+
+def clean_metar_text(value: str) -> str:
+    cleaned = value.strip()
+    if not cleaned:
+        raise ValueError("El METAR está vacío.")
+    if not re.fullmatch(r"[A-Za-z0-9\s/+=\-.]+", cleaned):
+        raise ValueError("El METAR contiene caracteres no válidos.")
+    return cleaned
+
+
+MetarText = Annotated[
+    str,
+    StringConstraints(min_length=8, max_length=512),
+    AfterValidator(clean_metar_text),
+]
 
 
 class MetarRequest(BaseModel):
@@ -9,12 +27,7 @@ class MetarRequest(BaseModel):
     @field_validator("metar")
     @classmethod
     def validate_metar(cls, value: str) -> str:
-        cleaned = value.strip()
-        if not cleaned:
-            raise ValueError("El METAR está vacío.")
-        if not re.fullmatch(r"[A-Za-z0-9\s/+=\-.]+", cleaned):
-            raise ValueError("El METAR contiene caracteres no válidos.")
-        return cleaned
+        return clean_metar_text(value)
 
 
 class WindInfo(BaseModel):
@@ -23,6 +36,8 @@ class WindInfo(BaseModel):
     gusts: str | None = None
     variation: str | None = None
     degrees: int | None = None
+    speed_kt: int | None = None
+    gusts_kt: int | None = None
     text: str | None = None
 
 
@@ -30,12 +45,15 @@ class VisibilityInfo(BaseModel):
     main: str | None = None
     minimum: str | None = None
     vertical: str | None = None
+    meters: int | None = None
     text: str | None = None
 
 
 class TemperatureInfo(BaseModel):
     air: str | None = None
     dewpoint: str | None = None
+    air_c: int | None = None
+    dewpoint_c: int | None = None
     text: str | None = None
 
 
@@ -52,9 +70,53 @@ class MetarResponse(BaseModel):
     clouds: list[str] = Field(default_factory=list)
     temperature: TemperatureInfo = Field(default_factory=TemperatureInfo)
     qnh: str | None = None
+    qnh_hpa: int | None = None
     qnh_text: str | None = None
     rvr: list[str] = Field(default_factory=list)
     remarks: str | None = None
     trends: list[str] = Field(default_factory=list)
     unavailable_groups: list[str] = Field(default_factory=list)
     report_text: str | None = None
+
+
+class IngestRequest(BaseModel):
+    metars: list[MetarText] = Field(..., min_length=1, max_length=10000)
+    # Fecha próxima a las observaciones del lote, para archivos históricos.
+    reference_time: datetime | None = None
+
+
+class IngestResponse(BaseModel):
+    received: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    superseded: int = 0
+    invalid: int = 0
+    reports: list[MetarResponse] = Field(default_factory=list)
+
+
+class AggregateWindow(BaseModel):
+    window: str
+    since: datetime
+    until: datetime
+    reports: int = 0
+    temperature_min: int | None = None
+    temperature_max: int | None = None
+    temperature_mean: float | None = None
+    gust_max: int | None = None
+    visibility_min: int | None = None
+    qnh_trend: int | None = None
+
+
+class StationAggregatesResponse(BaseModel):
+    station: str
+    latest_observation: datetime
+    windows: list[AggregateWindow] = Field(default_factory=list)
+
+
+class StationResult(BaseModel):
+    icao: str
+    name: str
+    lat: float
+    lon: float
+    distance_km: float | None = None
+    latest_report: MetarResponse | None = None
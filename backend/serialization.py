@@ -0,0 +1,168 @@
+import math
+from functools import lru_cache
+from operator import itemgetter
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - dependencia opcional
+    cbor2 = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+CBOR_MEDIA_TYPE = "application/cbor"
+COMPACT_MEDIA_TYPE = "application/vnd.metar-stall.compact+json"
+
+_MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _field_getter(names):
+    # `itemgetter` con un único nombre devuelve el valor suelto, no una tupla.
+    if len(names) == 1:
+        name = names[0]
+        return lambda values: (values[name],)
+    if not names:
+        return lambda values: ()
+    return itemgetter(*names)
+
+
+@lru_cache(maxsize=None)
+def _compact_getters(model_cls: type[BaseModel]):
+    # Se evita `model_dump()`: los valores se leen en C del `__dict__` de la
+    # instancia (más rápido que el acceso por atributo) y solo los submodelos
+    # se recorren de nuevo.
+    fields = model_cls.model_fields
+    names = tuple(fields)
+    nested = [
+        (position, name, _compact_getters(field.annotation))
+        for position, (name, field) in enumerate(fields.items())
+        if _is_model(field.annotation)
+    ]
+    return _field_getter(names), nested
+
+
+def _compact_values(model: BaseModel, getters) -> list:
+    getter, nested = getters
+    values = list(getter(model.__dict__))
+    for position, _, nested_getters in nested:
+        values[position] = _compact_values(values[position], nested_getters)
+    return values
+
+
+def _dict_values(model: BaseModel, getters) -> dict:
+    _, nested = getters
+    values = dict(model.__dict__)
+    for _, name, nested_getters in nested:
+        values[name] = _dict_values(values[name], nested_getters)
+    return values
+
+
+def to_compact(model: BaseModel) -> list:
+    """Convierte un modelo en una lista de valores siguiendo el orden de sus campos."""
+    return _compact_values(model, _compact_getters(type(model)))
+
+
+def to_plain_dict(model: BaseModel) -> dict:
+    """Equivalente a `model_dump()` sin pasar por el serializador de pydantic (para msgpack/CBOR)."""
+    return _dict_values(model, _compact_getters(type(model)))
+
+
+def compact_layout(model_cls: type[BaseModel]) -> list:
+    """Describe el orden de campos usado por `to_compact` (los submodelos como `[nombre, [...]]`)."""
+    layout = []
+    for name, field in model_cls.model_fields.items():
+        if _is_model(field.annotation):
+            layout.append([name, compact_layout(field.annotation)])
+        else:
+            layout.append(name)
+    return layout
+
+
+def _encode_json(model: BaseModel) -> bytes:
+    return model.model_dump_json().encode("utf-8")
+
+
+def _encode_compact(model: BaseModel) -> bytes:
+    return to_json(to_compact(model))
+
+
+def _encode_msgpack(model: BaseModel) -> bytes:
+    return msgpack.packb(to_plain_dict(model), use_bin_type=True)
+
+
+def _encode_cbor(model: BaseModel) -> bytes:
+    return cbor2.dumps(to_plain_dict(model))
+
+
+def available_encoders() -> dict:
+    encoders = {
+        JSON_MEDIA_TYPE: _encode_json,
+        COMPACT_MEDIA_TYPE: _encode_compact,
+    }
+    if msgpack is not None:
+        encoders[MSGPACK_MEDIA_TYPE] = _encode_msgpack
+    if cbor2 is not None:
+        encoders[CBOR_MEDIA_TYPE] = _encode_cbor
+    return encoders
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        parts = [part.strip() for part in item.split(";")]
+        media_type = parts[0].lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+                if math.isnan(quality) or not 0 <= quality <= 1:
+                    quality = 0.0
+        ranges.append((position, _MEDIA_TYPE_ALIASES.get(media_type, media_type), quality))
+    # Orden estable: primero por calidad, después por posición en la cabecera.
+    ranges.sort(key=lambda item: (-item[2], item[0]))
+    return [(media_type, quality) for _, media_type, quality in ranges]
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """Elige el formato de respuesta a partir de la cabecera `Accept`.
+
+    JSON es el formato por defecto: se usa si la cabecera falta, si acepta
+    cualquier tipo o si ninguno de los formatos pedidos está disponible.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    encoders = available_encoders()
+    for media_type, quality in _parse_accept(accept):
+        if quality <= 0:
+            continue
+        if media_type in {"*/*", "application/*"}:
+            return JSON_MEDIA_TYPE
+        if media_type in encoders:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def encode_model(model: BaseModel, media_type: str) -> bytes:
+    return available_encoders()[media_type](model)
@@ -0,0 +1,143 @@
+import heapq
+import math
+import threading
+from bisect import bisect_left, bisect_right
+
+from .airports import AIRPORT_COORDINATES, SPANISH_AIRPORTS
+from .schemas import StationResult
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _to_unit_vector(lat, lon):
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class _Node:
+    __slots__ = ("icao", "point", "axis", "left", "right")
+
+    def __init__(self, icao, point, axis, left, right):
+        self.icao = icao
+        self.point = point
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+def _build_tree(items, depth=0):
+    if not items:
+        return None
+    axis = depth % 3
+    items.sort(key=lambda item: item[1][axis])
+    middle = len(items) // 2
+    icao, point = items[middle]
+    return _Node(
+        icao,
+        point,
+        axis,
+        _build_tree(items[:middle], depth + 1),
+        _build_tree(items[middle + 1:], depth + 1),
+    )
+
+
+class StationIndex:
+    """Índice espacial de estaciones construido una sola vez al arrancar.
+
+    Las búsquedas de vecinos usan un k-d tree sobre vectores unitarios 3D: la
+    distancia euclídea (cuerda) crece igual que la distancia de círculo máximo,
+    así que no hay distorsión cerca de los polos ni del antimeridiano. Las
+    consultas por recuadro usan una lista ordenada por latitud.
+    """
+
+    def __init__(self, coordinates):
+        self.coordinates = dict(coordinates)
+        self._root = _build_tree([(icao, _to_unit_vector(*latlon)) for icao, latlon in self.coordinates.items()])
+        self._by_lat = sorted((lat, icao) for icao, (lat, _) in self.coordinates.items())
+        self._lats = [lat for lat, _ in self._by_lat]
+
+    def nearest(self, lat, lon, k=1):
+        """Devuelve hasta `k` pares `(icao, distancia_km)` ordenados por distancia."""
+        if k <= 0 or self._root is None:
+            return []
+        target = _to_unit_vector(lat, lon)
+        heap = []  # max-heap de tamaño k con (-distancia², icao)
+
+        def visit(node):
+            if node is None:
+                return
+            dist_sq = sum((a - b) ** 2 for a, b in zip(node.point, target))
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist_sq, node.icao))
+            elif dist_sq < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist_sq, node.icao))
+
+            delta = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            visit(near)
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return [(icao, _chord_to_km(math.sqrt(-neg))) for neg, icao in sorted(heap, reverse=True)]
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Estaciones dentro del recuadro. Si `min_lon > max_lon` cruza el antimeridiano."""
+        start = bisect_left(self._lats, min_lat)
+        end = bisect_right(self._lats, max_lat)
+        result = []
+        for _, icao in self._by_lat[start:end]:
+            lon = self.coordinates[icao][1]
+            if min_lon <= max_lon:
+                inside = min_lon <= lon <= max_lon
+            else:
+                inside = lon >= min_lon or lon <= max_lon
+            if inside:
+                result.append(icao)
+        return result
+
+
+class LatestReports:
+    """Último informe decodificado de cada estación, según su hora de observación."""
+
+    def __init__(self):
+        self._reports = {}
+        self._lock = threading.Lock()
+
+    def add(self, station, observed_at, report):
+        with self._lock:
+            current = self._reports.get(station)
+            if current is None or observed_at >= current[0]:
+                self._reports[station] = (observed_at, report)
+
+    def get(self, station):
+        with self._lock:
+            entry = self._reports.get(station)
+        return entry[1] if entry else None
+
+
+def station_results(index, latest_reports, matches):
+    """Une cada `(icao, distancia_km | None)` con sus datos y su último informe."""
+    results = []
+    for icao, distance in matches:
+        lat, lon = index.coordinates[icao]
+        results.append(
+            StationResult(
+                icao=icao,
+                name=SPANISH_AIRPORTS.get(icao, "Aeropuerto no identificado"),
+                lat=lat,
+                lon=lon,
+                distance_km=round(distance, 1) if distance is not None else None,
+                latest_report=latest_reports.get(icao),
+            )
+        )
+    return results
+
+
+STATION_INDEX = StationIndex(AIRPORT_COORDINATES)
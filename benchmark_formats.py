@@ -0,0 +1,23 @@
+import timeit
+
+from backend.serialization import available_encoders
+from backend.service import decode_metar_payload
+
+test_metars = [
+    "METAR LEMD 121330Z 21015G25KT 180V250 9999 FEW030 14/05 Q1012=",
+    "METAR LEBL 121400Z 02010KT 5000 -RA BR BKN010 10/09 Q1008 NOSIG=",
+    "SPECI LEZG 121415Z 30020KT 2000 +TSGR BKN005CB 08/06 Q0998=",
+    "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="
+]
+
+ITERATIONS = 20000
+
+decoded = [decode_metar_payload(m) for m in test_metars]
+
+print(f"{'Formato':<45} {'Bytes medios':>12} {'µs/informe':>12}")
+print("-" * 71)
+for media_type, encoder in available_encoders().items():
+    size = sum(len(encoder(d)) for d in decoded) / len(decoded)
+    elapsed = timeit.timeit(lambda: [encoder(d) for d in decoded], number=ITERATIONS)
+    per_report_us = elapsed / (ITERATIONS * len(decoded)) * 1_000_000
+    print(f"{media_type:<45} {size:>12.1f} {per_report_us:>12.2f}")
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+from backend.aggregates import RollingAggregates
+from backend.ingest import DedupIndex, ingest_reports
+from backend.service import decode_metar_payload
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=timezone.utc)
+
+
+def _add(aggregates, hours_ago, body):
+    observed_at = NOW - timedelta(hours=hours_ago)
+    metar = f"METAR LEMD {observed_at:%d%H%M}Z {body}="
+    aggregates.add("LEMD", observed_at, decode_metar_payload(metar))
+
+
+def test_rollups_track_min_max_gust_visibility_and_qnh_trend():
+    aggregates = RollingAggregates()
+    _add(aggregates, 30, "27010KT 9999 FEW030 02/M01 Q1020")
+    _add(aggregates, 5, "27015G30KT 4000 BR BKN010 08/06 Q1014")
+    _add(aggregates, 0, "27012G22KT CAVOK 12/04 Q1010")
+
+    windows = {w.window: w for w in aggregates.get("LEMD").windows}
+
+    assert windows["1h"].reports == 1
+    assert windows["1h"].gust_max == 22
+    assert windows["24h"].reports == 2
+    assert windows["24h"].temperature_min == 8
+    assert windows["24h"].temperature_max == 12
+    assert windows["24h"].temperature_mean == 10.0
+    assert windows["24h"].gust_max == 30
+    assert windows["24h"].visibility_min == 4000
+    assert windows["24h"].qnh_trend == -4
+    assert windows["7d"].reports == 3
+    assert windows["7d"].temperature_min == 2
+    assert windows["7d"].qnh_trend == -10
+
+
+def test_rollups_expire_old_buckets():
+    aggregates = RollingAggregates()
+    _add(aggregates, 200, "27010KT 9999 FEW030 02/M01 Q1020")
+    _add(aggregates, 0, "27012KT CAVOK 12/04 Q1010")
+
+    windows = {w.window: w for w in aggregates.get("LEMD").windows}
+
+    assert windows["7d"].reports == 1
+    assert windows["7d"].temperature_min == 12
+    assert aggregates.get("LEBL") is None
+
+
+def test_ingest_places_backfill_with_reference_time():
+    aggregates = RollingAggregates()
+    reference = datetime(2019, 7, 15, tzinfo=timezone.utc)
+    ingest_reports(
+        ["METAR LEMD 141200Z 27010KT 9999 FEW030 31/12 Q1012="],
+        DedupIndex(),
+        aggregates,
+        reference_time=reference,
+    )
+
+    assert aggregates.get("LEMD").latest_observation == datetime(2019, 7, 14, 12, 0, tzinfo=timezone.utc)
+
+
+def test_corrected_report_replaces_original_in_rollups():
+    aggregates = RollingAggregates()
+    result = ingest_reports(
+        [
+            "METAR LEMD 121400Z 27010KT 9999 FEW030 14/05 Q1012=",
+            "METAR COR LEMD 121400Z 27010KT 9999 FEW030 20/05 Q1012=",
+        ],
+        DedupIndex(),
+        aggregates,
+        reference_time=datetime(2026, 3, 12, 15, 0, tzinfo=timezone.utc),
+    )
+
+    windows = {w.window: w for w in aggregates.get("LEMD").windows}
+
+    assert result.superseded == 1
+    for name in ("1h", "24h", "7d"):
+        assert windows[name].reports == 1
+        assert windows[name].temperature_mean == 20.0
+        assert windows[name].temperature_min == 20
@@ -1,6 +1,9 @@
+import pytest
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
 
 from backend.app import create_app
+from backend.serialization import to_compact, to_plain_dict
 
 
 client = TestClient(create_app())
@@ -30,3 +33,136 @@ def test_decode_rejects_invalid_characters():
 
     assert response.status_code == 422
     assert "caracteres no válidos" in str(data)
+
+
+def test_decode_defaults_to_json():
+    payload = {"metar": "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="}
+    response = client.post("/decode", json=payload, headers={"Accept": "*/*"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json()["station"] == "LEVC"
+
+
+def test_decode_negotiates_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+    payload = {"metar": "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="}
+    response = client.post("/decode", json=payload, headers={"Accept": "application/msgpack"})
+    data = msgpack.unpackb(response.content)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert data["station"] == "LEVC"
+    assert data["qnh"] == "1015 hPa"
+
+
+def test_decode_negotiates_compact_layout():
+    payload = {"metar": "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="}
+    response = client.post(
+        "/decode",
+        json=payload,
+        headers={"Accept": "application/vnd.metar-stall.compact+json"},
+    )
+    layout = client.get("/decode/layout").json()["fields"]
+    data = response.json()
+
+    assert response.status_code == 200
+    assert len(data) == len(layout)
+    assert data[layout.index("station")] == "LEVC"
+    assert data[layout.index("qnh")] == "1015 hPa"
+
+
+def test_compact_handles_single_field_models():
+    class Inner(BaseModel):
+        value: int
+
+    class Outer(BaseModel):
+        inner: Inner
+
+    model = Outer(inner=Inner(value=7))
+
+    assert to_compact(model) == [[7]]
+    assert to_plain_dict(model) == model.model_dump()
+
+
+def test_decode_negotiates_cbor():
+    cbor2 = pytest.importorskip("cbor2")
+    payload = {"metar": "METAR LEMD 121330Z 21015G25KT 180V250 9999 FEW030 14/05 Q1012="}
+    json_data = client.post("/decode", json=payload).json()
+    response = client.post("/decode", json=payload, headers={"Accept": "application/cbor"})
+
+    assert response.headers["content-type"] == "application/cbor"
+    assert cbor2.loads(response.content) == json_data
+
+
+def test_ingest_reports_duplicates():
+    metar = "METAR LEMD 121330Z 21015G25KT 180V250 9999 FEW030 14/05 Q1012="
+    response = client.post("/ingest", json={"metars": [metar, metar.removeprefix("METAR ")]})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["accepted"] == 1
+    assert data["duplicates"] == 1
+    assert data["reports"][0]["station"] == "LEMD"
+
+
+def test_station_aggregates_after_ingest():
+    metar = "METAR LEZG 121415Z 30020G35KT 2000 +TSGR BKN005CB 08/06 Q0998="
+    client.post("/ingest", json={"metars": [metar]})
+    response = client.get("/stations/LEZG/aggregates")
+    windows = {w["window"]: w for w in response.json()["windows"]}
+
+    assert response.status_code == 200
+    assert windows["1h"]["gust_max"] == 35
+    assert windows["1h"]["visibility_min"] == 2000
+
+
+def test_station_aggregates_unknown_station():
+    response = client.get("/stations/XXXX/aggregates")
+
+    assert response.status_code == 404
+
+
+def test_nearest_stations_join_latest_report():
+    metar = "METAR LEBL 121400Z 02010KT 5000 -RA BR BKN010 10/09 Q1008 NOSIG="
+    client.post("/ingest", json={"metars": [metar]})
+    response = client.get("/stations/nearest", params={"lat": 41.3, "lon": 2.08, "k": 2})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data[0]["icao"] == "LEBL"
+    assert data[0]["latest_report"]["qnh"] == "1008 hPa"
+    assert len(data) == 2
+
+
+def test_stations_bbox():
+    response = client.get(
+        "/stations/bbox",
+        params={"min_lat": 38.5, "min_lon": 1.0, "max_lat": 40.5, "max_lon": 4.5},
+    )
+
+    assert response.status_code == 200
+    assert {s["icao"] for s in response.json()} == {"LEIB", "LEMH", "LEPA", "LESB"}
+
+
+def test_decode_ignores_invalid_quality_values():
+    payload = {"metar": "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="}
+    for accept in ("application/msgpack;q=nan", "application/msgpack;q=inf", "application/msgpack;q=2"):
+        response = client.post("/decode", json=payload, headers={"Accept": accept})
+
+        assert response.headers["content-type"].startswith("application/json")
+
+
+def test_decode_documents_binary_formats():
+    content = client.get("/openapi.json").json()["paths"]["/decode"]["post"]["responses"]["200"]["content"]
+
+    assert {"application/json", "application/msgpack", "application/cbor"} <= set(content)
+    assert "application/vnd.metar-stall.compact+json" in content
+
+
+def test_ingest_validates_each_report():
+    too_long = {"metars": ["LEMD 121330Z " + "X" * 600]}
+    invalid_chars = {"metars": ["METAR LEMD 121330Z 21015KT 9999 <script>"]}
+
+    assert client.post("/ingest", json=too_long).status_code == 422
+    assert client.post("/ingest", json=invalid_chars).status_code == 422
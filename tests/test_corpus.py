@@ -0,0 +1,32 @@
+import io
+
+from backend.corpus import MAX_REPORT_LENGTH, iter_reports, write_corpus
+from backend.decoder import SpanishMetarParser
+from backend.schemas import MetarRequest
+
+
+def test_corpus_is_deterministic_for_seed():
+    assert list(iter_reports(50, seed=42)) == list(iter_reports(50, seed=42))
+    assert list(iter_reports(50, seed=42)) != list(iter_reports(50, seed=43))
+
+
+def test_corpus_reports_are_accepted_and_decoded():
+    for report in iter_reports(500, seed=1):
+        MetarRequest(metar=report)
+        decoded = SpanishMetarParser(report).parse()
+        assert decoded["station"]
+        assert decoded["airport_name"] != "Aeropuerto no identificado"
+
+
+def test_adversarial_reports_fill_max_length():
+    for report in iter_reports(30, seed=1, adversarial=True):
+        assert MAX_REPORT_LENGTH - 64 < len(report) <= MAX_REPORT_LENGTH
+        MetarRequest(metar=report)
+        SpanishMetarParser(report).parse()
+
+
+def test_write_corpus_one_report_per_line():
+    stream = io.StringIO()
+    write_corpus(stream, 10, seed=5)
+
+    assert stream.getvalue().splitlines() == list(iter_reports(10, seed=5))
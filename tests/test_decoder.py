@@ -23,3 +23,37 @@ def test_decoder_handles_cavok():
     assert decoded["visibility"]["main"] == "CAVOK"
     assert decoded["weather"] == []
     assert "Cielo despejado (CAVOK)" in decoded["clouds"]
+
+
+def test_decoder_splits_trend_groups():
+    metar = "METAR LEMD 121330Z 21015KT 9999 FEW030 14/05 Q1012 TEMPO 3000 BR BECMG NSC="
+    decoded = SpanishMetarParser(metar).parse()
+
+    assert decoded["trends"] == ["TEMPO: 3000 BR", "BECMG: NSC"]
+
+
+def test_decoder_handles_unavailable_vertical_visibility():
+    metar = "METAR LEHC 112030Z 08006KT 0300 FG VV/// 12/12 Q1021="
+    decoded = SpanishMetarParser(metar).parse()
+
+    assert decoded["visibility"]["vertical"] == "No disponible"
+
+
+def test_decoder_skips_correction_marker():
+    metar = "METAR COR LEVC 121430Z 12005KT CAVOK 18/12 Q1016="
+    decoded = SpanishMetarParser(metar).parse()
+
+    assert decoded["station"] == "LEVC"
+    assert decoded["qnh"] == "1016 hPa"
+
+
+def test_decoder_exposes_numeric_values():
+    metar = "METAR LEMD 121330Z 21015G25KT 180V250 4000 FEW030 M02/M05 Q1012="
+    decoded = SpanishMetarParser(metar).parse()
+
+    assert decoded["wind"]["speed_kt"] == 15
+    assert decoded["wind"]["gusts_kt"] == 25
+    assert decoded["visibility"]["meters"] == 4000
+    assert decoded["temperature"]["air_c"] == -2
+    assert decoded["temperature"]["dewpoint_c"] == -5
+    assert decoded["qnh_hpa"] == 1012
@@ -0,0 +1,172 @@
+import re
+import statistics
+import time
+
+import pytest
+
+import backend.decoder as decoder_module
+from backend.corpus import MAX_REPORT_LENGTH, iter_reports
+from backend.decoder import SpanishMetarParser
+
+HEAD = "METAR LEMD 121330Z 21015KT 9999 FEW030 14/05 Q1012 "
+# Unidad que se repite para construir cada entrada. Se llama al parser
+# directamente, sin el límite de 512 caracteres de la API, para medir cómo
+# crece el coste con la longitud.
+CRAFTED = {
+    "trend_chain": "TEMPO ",
+    "trend_chain_without_spaces": "BECMGTEMPO",
+    "single_trend_long_tail": "X ",
+    "trend_keyword_prefixes": "BECMG TEMPOX ",
+    "cloud_prefix_token": "FEW",
+    "wind_prefix_token": "12345",
+    "digits_token": "1",
+    "slash_tokens": "/ ",
+    "weather_token": "+TSRA",
+    "rvr_tokens": "R24/P1500VP1500N ",
+}
+BASE_LENGTH = 2048
+SCALE = 16
+# Con coste lineal el cociente ronda SCALE; uno cuadrático rondaría SCALE².
+MAX_GROWTH_RATIO = SCALE * 3
+# Techo holgado por informe de tamaño real (una decodificación normal tarda
+# decenas de microsegundos).
+MAX_REPORT_SECONDS = 0.005
+
+
+def _build(name, length):
+    unit = CRAFTED[name]
+    prefix = HEAD + "BECMG " if name == "single_trend_long_tail" else HEAD
+    return prefix + unit * (length // len(unit))
+
+
+def _median_decode_time(metar, repeats=7):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        SpanishMetarParser(metar).parse()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@pytest.mark.parametrize("name", sorted(CRAFTED))
+def test_decode_time_grows_linearly(name):
+    small = _median_decode_time(_build(name, BASE_LENGTH))
+    large = _median_decode_time(_build(name, BASE_LENGTH * SCALE))
+
+    assert large / small < MAX_GROWTH_RATIO
+
+
+@pytest.mark.parametrize("name", sorted(CRAFTED))
+def test_crafted_report_at_max_length_decodes_quickly(name):
+    metar = _build(name, MAX_REPORT_LENGTH)[:MAX_REPORT_LENGTH]
+
+    assert _median_decode_time(metar) < MAX_REPORT_SECONDS
+
+
+def test_adversarial_corpus_decodes_quickly():
+    timings = [_median_decode_time(metar, repeats=3) for metar in iter_reports(200, seed=11, adversarial=True)]
+
+    assert statistics.median(timings) < MAX_REPORT_SECONDS
+
+
+class _RecordingPattern:
+    """Envuelve un patrón compilado y registra el texto que analiza."""
+
+    def __init__(self, recorder, name, pattern):
+        self._recorder = recorder
+        self._name = name
+        self._pattern = pattern
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+    def _record(self, method):
+        def wrapper(string, *args, **kwargs):
+            self._recorder.record(self._name, string)
+            return method(string, *args, **kwargs)
+
+        return wrapper
+
+    @property
+    def match(self):
+        return self._record(self._pattern.match)
+
+    @property
+    def fullmatch(self):
+        return self._record(self._pattern.fullmatch)
+
+    @property
+    def search(self):
+        return self._record(self._pattern.search)
+
+    @property
+    def findall(self):
+        return self._record(self._pattern.findall)
+
+    @property
+    def finditer(self):
+        return self._record(self._pattern.finditer)
+
+
+class _RegexCallRecorder:
+    """Sustituye al módulo `re` del decodificador y registra el texto analizado."""
+
+    def __init__(self):
+        self.subjects = []
+        self.patterns = set()
+
+    def record(self, name, string):
+        self.patterns.add(name)
+        self.subjects.append(string)
+
+    def __getattr__(self, name):
+        return getattr(re, name)
+
+    def _record(self, function):
+        def wrapper(pattern, string, *args, **kwargs):
+            self.record(pattern, string)
+            return function(pattern, string, *args, **kwargs)
+
+        return wrapper
+
+    def compile(self, pattern, flags=0):
+        return _RecordingPattern(self, pattern, re.compile(pattern, flags))
+
+    @property
+    def match(self):
+        return self._record(re.match)
+
+    @property
+    def fullmatch(self):
+        return self._record(re.fullmatch)
+
+    @property
+    def search(self):
+        return self._record(re.search)
+
+    @property
+    def findall(self):
+        return self._record(re.findall)
+
+    @property
+    def finditer(self):
+        return self._record(re.finditer)
+
+
+def test_no_regex_scans_more_than_one_token(monkeypatch):
+    recorder = _RegexCallRecorder()
+    monkeypatch.setattr(decoder_module, "re", recorder)
+    # Los patrones precompilados a nivel de módulo no pasan por `re`.
+    compiled = {name: value for name, value in vars(decoder_module).items() if isinstance(value, re.Pattern)}
+    for name, pattern in compiled.items():
+        monkeypatch.setattr(decoder_module, name, _RecordingPattern(recorder, name, pattern))
+
+    metars = [_build(name, BASE_LENGTH) for name in CRAFTED]
+    metars += list(iter_reports(200, seed=7))
+    metars += list(iter_reports(50, seed=7, adversarial=True))
+    for metar in metars:
+        SpanishMetarParser(metar).parse()
+
+    assert compiled
+    assert set(compiled) <= recorder.patterns
+    assert not [subject for subject in recorder.subjects if len(subject.split()) > 1]
@@ -0,0 +1,51 @@
+from backend.ingest import DedupIndex, ingest_reports, normalize_report
+
+
+def test_normalize_report_ignores_prefix_and_terminator():
+    plain = normalize_report("LEVC 121430Z 12005KT CAVOK 18/12 Q1015")
+    prefixed = normalize_report("METAR  LEVC 121430Z 12005KT CAVOK 18/12 Q1015=")
+
+    assert plain == prefixed
+    assert plain[:2] == ("LEVC", "121430Z")
+
+
+def test_ingest_drops_duplicates_and_counts_superseded():
+    reports = [
+        "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015=",
+        "LEVC 121430Z 12005KT CAVOK 18/12 Q1015",
+        "SPECI LEVC 121430Z 12005KT CAVOK 18/12 Q1015=",
+        "METAR COR LEVC 121430Z 12005KT CAVOK 18/12 Q1016=",
+        "NO ES UN METAR",
+    ]
+    result = ingest_reports(reports, DedupIndex())
+
+    assert result.received == 5
+    assert result.accepted == 2
+    assert result.duplicates == 2
+    assert result.superseded == 1
+    assert result.invalid == 1
+    assert [r.qnh for r in result.reports] == ["1015 hPa", "1016 hPa"]
+
+
+def test_ingest_with_bloom_filter_drops_duplicates():
+    index = DedupIndex(bloom_capacity=1000)
+    reports = ["METAR LEBL 121400Z 02010KT 5000 -RA BR BKN010 10/09 Q1008 NOSIG="] * 3
+    result = ingest_reports(reports, index)
+
+    assert result.accepted == 1
+    assert result.duplicates == 2
+
+
+def test_resent_report_after_eviction_is_not_superseded():
+    a = "METAR LEVC 121430Z 12005KT CAVOK 18/12 Q1015="
+    b = "METAR LEBL 121400Z 02010KT 5000 -RA BR BKN010 10/09 Q1008 NOSIG="
+    c = "METAR LEMD 121330Z 21015G25KT 180V250 9999 FEW030 14/05 Q1012="
+    index = DedupIndex(max_entries=2)
+    # El duplicado de `a` lo refresca en el conjunto exacto, así que `c` expulsa
+    # la clave de `b` aunque su estación/hora siga registrada.
+    ingest_reports([a, b, a, c], index)
+    result = ingest_reports([b], index)
+
+    assert result.accepted == 0
+    assert result.duplicates == 1
+    assert result.superseded == 0
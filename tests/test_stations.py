@@ -0,0 +1,27 @@
+from backend.airports import AIRPORT_COORDINATES, SPANISH_AIRPORTS
+from backend.stations import STATION_INDEX, StationIndex
+
+
+def test_every_airport_has_coordinates():
+    assert set(AIRPORT_COORDINATES) == set(SPANISH_AIRPORTS)
+
+
+def test_nearest_returns_sorted_stations():
+    result = STATION_INDEX.nearest(40.42, -3.70, k=3)
+
+    assert [icao for icao, _ in result][:2] == ["LECU", "LEMD"]
+    assert [d for _, d in result] == sorted(d for _, d in result)
+
+
+def test_nearest_matches_brute_force_across_antimeridian():
+    index = StationIndex({"AAAA": (0.0, 179.5), "BBBB": (0.0, -179.5), "CCCC": (0.0, 170.0)})
+    result = index.nearest(0.0, -179.9, k=2)
+
+    assert [icao for icao, _ in result] == ["BBBB", "AAAA"]
+    assert round(result[0][1]) == 44
+
+
+def test_within_bbox():
+    canarias = STATION_INDEX.within_bbox(27.5, -18.5, 29.5, -13.0)
+
+    assert set(canarias) == {icao for icao in AIRPORT_COORDINATES if icao.startswith("GC")}